@@ -5,8 +5,12 @@ Generates persona-specific responses based on retrieved content.
 Personas speak in FIRST PERSON and embody their authentic characteristics.
 """
 
-from anthropic import Anthropic
-from typing import List
+import functools
+import hashlib
+from collections import OrderedDict
+
+from anthropic import AsyncAnthropic
+from typing import AsyncIterator, List, Optional, Tuple, Union
 
 
 # Persona-specific traits database
@@ -44,40 +48,50 @@ PERSONA_TRAITS = {
     }
 }
 
+# Anthropic only caches prompt prefixes above ~1024 tokens, so smaller
+# contexts are sent as a plain string (roughly 3-4 chars per token)
+PROMPT_CACHE_MIN_CHARS = 3000
 
-class PersonaLLM:
-    """LLM interface for generating persona responses."""
+# Number of generated responses kept for repeated questions
+RESPONSE_CACHE_SIZE = 128
 
-    def __init__(self, api_key: str):
-        self.client = Anthropic(api_key=api_key)
-        self.model = "claude-sonnet-4-5-20250929"
+# Generated responses keyed by persona, question and content version (LRU).
+# Module-level so answers outlive the per-API-key clients, which are closed
+# and recreated between sessions.
+_response_cache: "OrderedDict[str, str]" = OrderedDict()
 
-    def _get_persona_prompt(self, person_name: str, context: List[str], question: str) -> str:
-        """
-        Build a RAG prompt with persona-specific instructions.
+# Short questions whose keywords are mostly found in the retrieved content
+# are answered by the faster model (see SimpleSearch.search_prepared_with_score)
+FAST_MODEL_MAX_QUESTION_CHARS = 120
+FAST_MODEL_MIN_RETRIEVAL_SCORE = 0.75
 
-        Args:
-            person_name: Name of the persona
-            context: Retrieved content chunks
-            question: The user's question
 
-        Returns:
-            Complete prompt for the LLM
-        """
-        person_lower = person_name.lower()
+@functools.lru_cache(maxsize=64)
+def _build_persona_instructions(person_name: str) -> str:
+    """
+    Build the persona instruction block (everything before the context).
 
-        # Get persona traits if available
-        traits = PERSONA_TRAITS.get(person_lower, {
-            "style": "authentic and true to their public persona",
-            "speech_pattern": "natural conversational style",
-            "personality": "genuine and honest"
-        })
+    Cached per persona name, since it only depends on the name and traits.
 
-        # Build the context section
-        context_text = "\n\n---\n\n".join(context) if context else "No specific context available."
+    Args:
+        person_name: Name of the persona
+
+    Returns:
+        Persona instructions for the system prompt
+    """
+    person_lower = person_name.lower()
+
+    # Get persona traits if available
+    traits = PERSONA_TRAITS.get(person_lower, {
+        "style": "authentic and true to their public persona",
+        "speech_pattern": "natural conversational style",
+        "personality": "genuine and honest"
+    })
 
-        # Construct the system prompt
-        prompt = f"""You are {person_name}. You ARE this person - speak in FIRST PERSON ("I", "my", "me").
+    catchphrases = ", ".join(traits.get("catchphrases", []))
+    catchphrase_line = f"- Catchphrases you use: {catchphrases}" if catchphrases else ""
+
+    return f"""You are {person_name}. You ARE this person - speak in FIRST PERSON ("I", "my", "me").
 
 CRITICAL INSTRUCTIONS:
 - You ARE {person_name}. NOT an AI pretending to be them. You ARE them.
@@ -91,24 +105,209 @@ YOUR AUTHENTIC CHARACTER:
 - Style: {traits.get('style', 'authentic')}
 - Speech pattern: {traits.get('speech_pattern', 'natural')}
 - Personality: {traits.get('personality', 'genuine')}
-{f"- Catchphrases you use: {', '.join(traits.get('catchphrases', []))}" if traits.get('catchphrases') else ""}
+{catchphrase_line}
 
 IMPORTANT: Base your answers on the CONTEXT below, which contains your actual public statements and writings. Stay true to what YOU actually said and believe.
 
-If the context doesn't have enough information, say something like "I haven't publicly talked about that specific thing" or "That's not really my area" - but say it in YOUR authentic voice.
+If the context doesn't have enough information, say something like "I haven't publicly talked about that specific thing" or "That's not really my area" - but say it in YOUR authentic voice."""
+
+
+@functools.lru_cache(maxsize=256)
+def _join_context(chunks: Tuple[str, ...]) -> str:
+    """
+    Join retrieved content chunks into the prompt's context section.
+
+    Cached because repeated questions usually retrieve the same chunks,
+    which come from the in-memory chunk cache and hash cheaply.
+
+    Args:
+        chunks: Retrieved content chunks
+
+    Returns:
+        Context text for the prompt
+    """
+    return "\n\n---\n\n".join(chunks) if chunks else "No specific context available."
+
+
+class PersonaLLM:
+    """LLM interface for generating persona responses."""
+
+    def __init__(self, api_key: str):
+        self.client = AsyncAnthropic(
+            api_key=api_key,
+            default_headers={"anthropic-beta": "prompt-caching-2024-07-31"}
+        )
+        self.model = "claude-sonnet-4-5-20250929"
+        self.fast_model = "claude-haiku-4-5"
+
+    async def aclose(self):
+        """Close the underlying HTTP connection pool."""
+        await self.client.close()
+
+    def _response_cache_key(self, person_name: str, question: str, content_version: str) -> str:
+        """Build the response cache key for a question to a persona."""
+        normalized_question = " ".join(question.lower().split())
+        key = f"{person_name.lower()}|{normalized_question}|{content_version}"
+        return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get_cached_response(
+        self,
+        person_name: str,
+        question: str,
+        content_version: str
+    ) -> Optional[str]:
+        """
+        Get a previously generated response to the same question.
+
+        Args:
+            person_name: Name of the persona
+            question: The user's question
+            content_version: Version of the persona's content (see PersonaStorage.content_hash)
+
+        Returns:
+            The cached response, or None if there is none
+        """
+        key = self._response_cache_key(person_name, question, content_version)
+        response = _response_cache.get(key)
+        if response is not None:
+            _response_cache.move_to_end(key)
+        return response
 
-CONTEXT FROM YOUR ACTUAL STATEMENTS:
+    def _cache_response(self, person_name: str, question: str, content_version: str, response: str):
+        """Store a generated response, evicting the least recently used one if full."""
+        key = self._response_cache_key(person_name, question, content_version)
+        _response_cache[key] = response
+        _response_cache.move_to_end(key)
+        while len(_response_cache) > RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+
+    def _select_model(self, question: str, retrieval_score: Optional[float]) -> str:
+        """
+        Pick the model for a question.
+
+        Args:
+            question: The user's question
+            retrieval_score: Keyword match confidence (0.0-1.0) of the best retrieved chunk, if known
+
+        Returns:
+            The fast model for short, well-grounded questions, otherwise the default model
+        """
+        if (
+            retrieval_score is not None
+            and retrieval_score >= FAST_MODEL_MIN_RETRIEVAL_SCORE
+            and len(question) < FAST_MODEL_MAX_QUESTION_CHARS
+        ):
+            return self.fast_model
+
+        return self.model
+
+    def _get_persona_prompt(
+        self,
+        person_name: str,
+        context: List[str],
+        question: str
+    ) -> Union[str, List[dict]]:
+        """
+        Build a RAG prompt with persona-specific instructions.
+
+        Large prompts are split into an instructions block and a context block,
+        both marked for Anthropic prompt caching so repeated turns reuse them.
+
+        Args:
+            person_name: Name of the persona
+            context: Retrieved content chunks
+            question: The user's question
+
+        Returns:
+            Complete prompt for the LLM, either as a string or as cacheable
+            system content blocks
+        """
+        instructions = _build_persona_instructions(person_name)
+
+        # Build the context section
+        context_text = _join_context(tuple(context))
+
+        # Construct the context section (stable while retrieval returns the same chunks)
+        context_block = f"""CONTEXT FROM YOUR ACTUAL STATEMENTS:
 {context_text}
 
 Now answer this question as {person_name} (speaking as "I"):"""
 
-        return prompt
+        if len(context_text) <= PROMPT_CACHE_MIN_CHARS:
+            return f"{instructions}\n\n{context_block}"
+
+        return [
+            {"type": "text", "text": instructions, "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": context_block, "cache_control": {"type": "ephemeral"}}
+        ]
+
+    async def stream_response(
+        self,
+        person_name: str,
+        question: str,
+        context_chunks: List[str],
+        content_version: Optional[str] = None,
+        retrieval_score: Optional[float] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a persona response to a question as it is generated.
+
+        Args:
+            person_name: Name of the persona
+            question: The user's question
+            context_chunks: Relevant content chunks for context
+            content_version: Version of the persona's content; when given, the
+                response is stored in the response cache (callers check
+                get_cached_response first)
+            retrieval_score: Keyword match confidence (0.0-1.0) of the best
+                context chunk, used to route easy questions to the fast model
+
+        Yields:
+            Pieces of the generated response in the persona's voice
+        """
+        # Build the prompt
+        system_prompt = self._get_persona_prompt(person_name, context_chunks, question)
+        model = self._select_model(question, retrieval_score)
+        print(f"[LLM] Using model {model}")
+
+        # Call Claude
+        async with self.client.messages.stream(
+            model=model,
+            max_tokens=1024,
+            system=system_prompt,
+            messages=[
+                {
+                    "role": "user",
+                    "content": question
+                }
+            ]
+        ) as stream:
+            parts = []
+            async for text in stream.text_stream:
+                parts.append(text)
+                yield text
+
+            # Log prompt cache usage
+            response = await stream.get_final_message()
+            usage = getattr(response, "usage", None)
+            if usage is not None:
+                cache_created = getattr(usage, "cache_creation_input_tokens", None) or 0
+                cache_read = getattr(usage, "cache_read_input_tokens", None) or 0
+                print(f"[LLM] Prompt cache: {cache_created} tokens written, {cache_read} tokens read")
+
+        response_text = "".join(parts)
+        if not response_text:
+            yield "Sorry, I couldn't generate a response right now."
+        elif content_version is not None:
+            self._cache_response(person_name, question, content_version, response_text)
 
     async def generate_response(
         self,
         person_name: str,
         question: str,
-        context_chunks: List[str]
+        context_chunks: List[str],
+        content_version: Optional[str] = None,
+        retrieval_score: Optional[float] = None
     ) -> str:
         """
         Generate a persona response to a question.
@@ -117,32 +316,24 @@ Now answer this question as {person_name} (speaking as "I"):"""
             person_name: Name of the persona
             question: The user's question
             context_chunks: Relevant content chunks for context
+            content_version: Version of the persona's content, enables response caching
+            retrieval_score: Keyword match confidence of the best context chunk, enables fast-model routing
 
         Returns:
             Generated response in the persona's voice
         """
+        if content_version is not None:
+            cached = self.get_cached_response(person_name, question, content_version)
+            if cached is not None:
+                return cached
+
         try:
-            # Build the prompt
-            system_prompt = self._get_persona_prompt(person_name, context_chunks, question)
-
-            # Call Claude
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=1024,
-                system=system_prompt,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": question
-                    }
-                ]
-            )
-
-            # Extract the text from the response
-            if response.content and len(response.content) > 0:
-                return response.content[0].text
-
-            return f"Sorry, I couldn't generate a response right now."
+            parts = [
+                text async for text in self.stream_response(
+                    person_name, question, context_chunks, content_version, retrieval_score
+                )
+            ]
+            return "".join(parts)
 
         except Exception as e:
             return f"Error generating response: {str(e)}"
@@ -160,3 +351,4 @@ Now answer this question as {person_name} (speaking as "I"):"""
             PERSONA_TRAITS[person_lower] = {}
 
         PERSONA_TRAITS[person_lower].update(traits)
+        _build_persona_instructions.cache_clear()
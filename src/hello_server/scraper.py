@@ -5,48 +5,121 @@ Tries Crawl4AI first, falls back to simple HTTP scraping if browser automation f
 """
 
 import asyncio
+import importlib
+import importlib.util
 from typing import Optional
 import httpx
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 
-try:
-    from crawl4ai import AsyncWebCrawler
-    CRAWL4AI_AVAILABLE = True
-except ImportError:
-    CRAWL4AI_AVAILABLE = False
+# Crawl4AI (and Playwright behind it) is slow to import, so only check that
+# it's installed here and import it when the first browser is started
+CRAWL4AI_AVAILABLE = importlib.util.find_spec("crawl4ai") is not None
+if not CRAWL4AI_AVAILABLE:
     print("[Scraper] Crawl4AI not available, using fallback scraper")
 
 
+def _extract_text(html: str) -> str:
+    """
+    Extract clean text from an HTML page.
+
+    Args:
+        html: Decoded page body
+
+    Returns:
+        Page text without scripts, styles and navigation, one line per block
+    """
+    tree = LexborHTMLParser(html)
+
+    # Remove script and style elements
+    for node in tree.css("script, style, nav, footer, header"):
+        node.decompose()
+
+    # Get text
+    text = tree.body.text(separator='\n', strip=True) if tree.body else ''
+
+    # Clean up whitespace
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    return '\n'.join(lines)
+
+
 class WebScraper:
     """Web scraper with Crawl4AI and HTTP fallback."""
 
-    def __init__(self):
+    def __init__(self, max_concurrency: int = 5):
+        # Single browser shared by all URLs, started on first use
         self.crawler = None
+        self._crawler_failed = False
+        # Browser launch, owned by the scraper so cancelling a URL never interrupts it
+        self._crawler_task: Optional[asyncio.Task] = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _start_crawler(self):
+        """Import Crawl4AI and launch its browser."""
+        try:
+            crawl4ai = await asyncio.to_thread(importlib.import_module, "crawl4ai")
+            crawler = crawl4ai.AsyncWebCrawler(verbose=False)
+            await crawler.__aenter__()
+        except Exception:
+            # Don't retry the browser launch for every remaining URL
+            self._crawler_failed = True
+            raise
+
+        self.crawler = crawler
+        return crawler
+
+    async def _ensure_crawler(self):
+        """Start the shared Crawl4AI browser if it isn't running yet."""
+        if self._crawler_task is None:
+            self._crawler_task = asyncio.create_task(self._start_crawler())
+
+        # Shielded: a URL losing the HTTP race must not cancel a half-started browser
+        return await asyncio.shield(self._crawler_task)
+
+    async def aclose(self):
+        """Shut down the shared Crawl4AI browser, waiting for it to finish starting if needed."""
+        task, self._crawler_task = self._crawler_task, None
+        if task is not None:
+            try:
+                await task
+            except Exception:
+                # Launch failed, there's no browser to close
+                pass
+
+        crawler, self.crawler = self.crawler, None
+        if crawler is not None:
+            try:
+                await crawler.__aexit__(None, None, None)
+            except Exception as e:
+                print(f"[Scraper] Error closing Crawl4AI: {type(e).__name__}: {e}")
 
     async def _scrape_with_crawl4ai(self, url: str, timeout: int) -> Optional[str]:
         """Try scraping with Crawl4AI browser automation."""
-        if not CRAWL4AI_AVAILABLE:
+        if not CRAWL4AI_AVAILABLE or self._crawler_failed:
             return None
 
         try:
-            async with AsyncWebCrawler(verbose=False) as crawler:
+            crawler = await self._ensure_crawler()
+            if crawler is None:
+                return None
+
+            async with self._semaphore:
                 result = await asyncio.wait_for(
                     crawler.arun(url=url),
                     timeout=timeout
                 )
 
-                if result.success and result.markdown:
-                    print(f"[Scraper] Crawl4AI success for {url}")
-                    return result.markdown
+            if result.success and result.markdown:
+                print(f"[Scraper] Crawl4AI success for {url}")
+                return result.markdown
 
-                return None
+            return None
 
         except Exception as e:
             print(f"[Scraper] Crawl4AI failed for {url}: {type(e).__name__}: {e}")
             return None
 
     async def _scrape_with_http(self, url: str, timeout: int) -> Optional[str]:
-        """Fallback: Simple HTTP scraping with BeautifulSoup."""
+        """Fallback: Simple HTTP scraping with selectolax (Lexbor parser)."""
         try:
             async with httpx.AsyncClient(follow_redirects=True) as client:
                 response = await client.get(
@@ -58,18 +131,8 @@ class WebScraper:
                 )
 
                 if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-
-                    # Remove script and style elements
-                    for script in soup(["script", "style", "nav", "footer", "header"]):
-                        script.decompose()
-
-                    # Get text
-                    text = soup.get_text(separator='\n', strip=True)
-
-                    # Clean up whitespace
-                    lines = [line.strip() for line in text.splitlines() if line.strip()]
-                    cleaned_text = '\n'.join(lines)
+                    # Parse off the event loop so concurrent scrapes keep running
+                    cleaned_text = await asyncio.to_thread(_extract_text, response.text)
 
                     print(f"[Scraper] HTTP fallback success for {url} ({len(cleaned_text)} chars)")
                     return cleaned_text
@@ -81,26 +144,54 @@ class WebScraper:
             print(f"[Scraper] HTTP fallback error for {url}: {type(e).__name__}: {e}")
             return None
 
-    async def scrape_url(self, url: str, timeout: int = 15) -> Optional[str]:
+    async def scrape_url(self, url: str, timeout: int = 15, http_delay: float = 2.0) -> Optional[str]:
         """
         Scrape clean text content from a URL.
-        Tries Crawl4AI first, falls back to simple HTTP scraping.
+        Tries Crawl4AI first; if it hasn't finished after http_delay seconds,
+        races it against simple HTTP scraping and uses whichever succeeds first.
 
         Args:
             url: The URL to scrape
             timeout: Timeout in seconds for the scraping operation
+            http_delay: Head start in seconds given to Crawl4AI before the HTTP fallback starts
 
         Returns:
             Cleaned text content, or None if scraping failed
         """
-        # Try Crawl4AI first
-        result = await self._scrape_with_crawl4ai(url, timeout)
-        if result:
-            return result
-
-        # Fallback to simple HTTP scraping
-        print(f"[Scraper] Falling back to HTTP scraping for {url}")
-        return await self._scrape_with_http(url, timeout)
+        crawl_task = asyncio.create_task(self._scrape_with_crawl4ai(url, timeout))
+        tasks = {crawl_task}
+
+        try:
+            # Give Crawl4AI a head start
+            done, _ = await asyncio.wait(tasks, timeout=http_delay)
+
+            if done:
+                result = crawl_task.result()
+                if result:
+                    return result
+
+                # Fallback to simple HTTP scraping
+                print(f"[Scraper] Falling back to HTTP scraping for {url}")
+                return await self._scrape_with_http(url, timeout)
+
+            # Crawl4AI is slow, race it against the HTTP fallback
+            print(f"[Scraper] Racing HTTP scraping against Crawl4AI for {url}")
+            tasks.add(asyncio.create_task(self._scrape_with_http(url, timeout)))
+
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+
+                # Prefer Crawl4AI's output if both finished together
+                for task in sorted(done, key=lambda t: t is not crawl_task):
+                    result = task.result()
+                    if result:
+                        return result
+
+            return None
+
+        finally:
+            for task in tasks:
+                task.cancel()
 
     async def scrape_multiple(self, urls: list[str], timeout: int = 15) -> dict[str, Optional[str]]:
         """
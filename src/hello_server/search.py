@@ -4,8 +4,40 @@ Web search module using Serper API.
 Finds relevant content about a person using targeted search queries.
 """
 
+import asyncio
+
 import httpx
+import orjson
 from typing import List, Dict
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+# Query parameters that only track clicks and don't change page content
+TRACKING_PARAMS = {"fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid"}
+
+
+def _canonical_url(url: str) -> str:
+    """
+    Normalize a URL for deduplication.
+
+    Lowercases the scheme and host, drops tracking query parameters
+    (utm_*, fbclid, gclid, ...), the fragment and any trailing slash.
+
+    Args:
+        url: URL to normalize
+
+    Returns:
+        Canonical form of the URL
+    """
+    parts = urlsplit(url.strip())
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    ]
+    path = parts.path.rstrip("/")
+
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
 
 
 class SerperSearch:
@@ -14,6 +46,62 @@ class SerperSearch:
     def __init__(self, api_key: str):
         self.api_key = api_key
         self.base_url = "https://google.serper.dev/search"
+        # Shared client keeps keep-alive connections to Serper warm between searches
+        self._client = httpx.AsyncClient(
+            timeout=10.0,
+            headers={
+                "X-API-KEY": api_key,
+                "Content-Type": "application/json"
+            }
+        )
+
+    async def aclose(self):
+        """Close the underlying HTTP client."""
+        await self._client.aclose()
+
+    async def _run_query(self, query: str, num: int) -> List[Dict[str, str]]:
+        """
+        Run a single Serper query.
+
+        Args:
+            query: Search query
+            num: Number of results to request
+
+        Returns:
+            List of dictionaries with 'url', 'title', and 'snippet' keys
+            (empty if the query failed)
+        """
+        try:
+            response = await self._client.post(
+                self.base_url,
+                content=orjson.dumps({"q": query, "num": num})
+            )
+
+            if response.status_code != 200:
+                print(f"[Serper] Query '{query}' failed with status {response.status_code}: {response.text}")
+                return []
+
+            data = orjson.loads(response.content)
+
+        except Exception as e:
+            print(f"[Serper] Exception for query '{query}': {type(e).__name__}: {e}")
+            return []
+
+        organic_results = data.get("organic", [])
+
+        print(f"[Serper] Query '{query}' returned {len(organic_results)} organic results")
+
+        if len(organic_results) == 0:
+            print(f"[Serper] Full response for '{query}': {data}")
+
+        return [
+            {
+                "url": result.get("link", ""),
+                "title": result.get("title", ""),
+                "snippet": result.get("snippet", "")
+            }
+            for result in organic_results
+        ]
 
     async def search_person(self, person_name: str, max_results: int = 10) -> List[Dict[str, str]]:
         """
@@ -34,60 +122,33 @@ class SerperSearch:
             f'"{person_name}" opinions',
         ]
 
-        all_results = []
-
-        async with httpx.AsyncClient() as client:
-            for query in queries:
-                try:
-                    response = await client.post(
-                        self.base_url,
-                        headers={
-                            "X-API-KEY": self.api_key,
-                            "Content-Type": "application/json"
-                        },
-                        json={
-                            "q": query,
-                            "num": max_results // len(queries) + 1  # Distribute across queries
-                        },
-                        timeout=10.0
-                    )
-
-                    if response.status_code == 200:
-                        data = response.json()
-                        organic_results = data.get("organic", [])
-
-                        print(f"[Serper] Query '{query}' returned {len(organic_results)} organic results")
-
-                        if len(organic_results) == 0:
-                            print(f"[Serper] Full response for '{query}': {data}")
-
-                        for result in organic_results:
-                            all_results.append({
-                                "url": result.get("link", ""),
-                                "title": result.get("title", ""),
-                                "snippet": result.get("snippet", "")
-                            })
-                    else:
-                        print(f"[Serper] Query '{query}' failed with status {response.status_code}: {response.text}")
-
-                except Exception as e:
-                    print(f"[Serper] Exception for query '{query}': {type(e).__name__}: {e}")
-                    continue
+        num = max_results // len(queries) + 1  # Distribute across queries
+
+        # Run all queries concurrently
+        query_results = await asyncio.gather(*(self._run_query(query, num) for query in queries))
 
-        # Deduplicate by URL and limit to max_results
+        # Deduplicate by canonical URL in query order (interviews first),
+        # stopping at max_results
         seen_urls = set()
         unique_results = []
 
-        for result in all_results:
-            url = result["url"]
-            if url and url not in seen_urls:
-                seen_urls.add(url)
-                unique_results.append(result)
+        for results in query_results:
+            for result in results:
+                if len(unique_results) >= max_results:
+                    break
+
+                url = result["url"]
+                if not url:
+                    continue
+
+                canonical_url = _canonical_url(url)
+                if canonical_url not in seen_urls:
+                    seen_urls.add(canonical_url)
+                    unique_results.append(result)
 
             if len(unique_results) >= max_results:
                 break
 
-        final_results = unique_results[:max_results]
-        print(f"[Serper] Returning {len(final_results)} unique results for '{person_name}'")
+        print(f"[Serper] Returning {len(unique_results)} unique results for '{person_name}'")
 
-        return final_results
+        return unique_results
@@ -5,6 +5,11 @@ Creates AI personas based on real online content using RAG.
 Personas speak in first person and embody authentic characteristics.
 """
 
+import asyncio
+import contextlib
+import os
+from typing import Dict
+
 from pydantic import BaseModel, Field
 from mcp.server.fastmcp import Context, FastMCP
 from smithery.decorators import smithery
@@ -14,6 +19,7 @@ from .storage import PersonaStorage
 from .search import SerperSearch
 from .scraper import WebScraper
 from .simple_search import SimpleSearch
+from .vector_search import VectorSearch, VECTOR_SEARCH_AVAILABLE
 from .llm import PersonaLLM
 
 
@@ -24,10 +30,86 @@ class ConfigSchema(BaseModel):
     anthropic_api_key: str = Field(..., description="Anthropic API key for Claude LLM")
 
 
+# Max characters buffered before forwarding partial ask_persona output
+STREAM_FLUSH_CHARS = 200
+
+
 # Initialize shared state (persona state manager and storage)
 state_manager = PersonaStateManager()
-storage = PersonaStorage()
+storage = PersonaStorage(metadata_backend=os.environ.get("PERSONA_METADATA_BACKEND", "jsonl"))
 simple_search = SimpleSearch()
+vector_search = VectorSearch() if VECTOR_SEARCH_AVAILABLE else None
+
+
+# Shared API clients keyed by API key (keys come from deployment config, so
+# there are only a few); closed when the last session ends
+_llm_clients: Dict[str, PersonaLLM] = {}
+_search_clients: Dict[str, SerperSearch] = {}
+_active_sessions = 0
+
+
+def _get_llm(api_key: str) -> PersonaLLM:
+    """Get a shared LLM client for an Anthropic API key."""
+    llm = _llm_clients.get(api_key)
+    if llm is None:
+        llm = _llm_clients[api_key] = PersonaLLM(api_key=api_key)
+    return llm
+
+
+def _get_search(api_key: str) -> SerperSearch:
+    """Get a shared search client for a Serper API key."""
+    search = _search_clients.get(api_key)
+    if search is None:
+        search = _search_clients[api_key] = SerperSearch(api_key=api_key)
+    return search
+
+
+async def _close_clients():
+    """Close all shared API clients and their connection pools."""
+    clients = [*_llm_clients.values(), *_search_clients.values()]
+    _llm_clients.clear()
+    _search_clients.clear()
+
+    for client in clients:
+        try:
+            await client.aclose()
+        except Exception as e:
+            print(f"[Server] Error closing {type(client).__name__}: {type(e).__name__}: {e}")
+
+
+@contextlib.asynccontextmanager
+async def _client_lifespan(server: FastMCP):
+    """
+    Track running sessions and close the shared API clients when the last one ends.
+
+    FastMCP enters the lifespan once per session over HTTP (once in total
+    over stdio), so this also closes the clients on shutdown.
+    """
+    global _active_sessions
+    _active_sessions += 1
+    try:
+        yield {}
+    finally:
+        _active_sessions -= 1
+        if _active_sessions == 0:
+            await _close_clients()
+
+
+def _get_session(ctx: Context):
+    """Get the client session a tool call belongs to (None outside a request)."""
+    try:
+        return ctx.session if ctx else None
+    except ValueError:
+        return None
+
+
+def _prepare_search_chunks(person_name: str):
+    """Precompute keyword search data for all of a persona's stored content."""
+    chunks = [
+        {**simple_search.prepare_chunk(text), "file": file}
+        for file, text in storage.iter_content_items(person_name)
+    ]
+    storage.save_chunks(person_name, chunks)
 
 
 @smithery.server(config_schema=ConfigSchema)
@@ -39,7 +121,8 @@ def create_server():
         instructions="""An MCP server that creates AI personas based on real online content.
 
 Initialize a persona with init_persona, then ask questions with ask_persona.
-The persona will respond in FIRST PERSON based on their actual public statements."""
+The persona will respond in FIRST PERSON based on their actual public statements.""",
+        lifespan=_client_lifespan
     )
 
     @server.tool()
@@ -61,7 +144,7 @@ The persona will respond in FIRST PERSON based on their actual public statements
             serper_key = config.serper_api_key
 
             # Initialize services
-            search = SerperSearch(api_key=serper_key)
+            search = _get_search(serper_key)
             scraper = WebScraper()
 
             # Step 1: Search for content
@@ -80,26 +163,49 @@ The persona will respond in FIRST PERSON based on their actual public statements
 
             # Step 2: Scrape content
             await ctx.info(f"🕷️ Scraping content from {len(urls)} URLs...")
-            scraped_data = await scraper.scrape_multiple(urls)
+            try:
+                scraped_data = await scraper.scrape_multiple(urls)
+            finally:
+                await scraper.aclose()
 
             # Step 3: Store content
             total_chars = 0
             successful_scrapes = 0
 
+            items_to_save = []
+
             for url, content in scraped_data.items():
                 if content and len(content.strip()) > 100:  # Minimum content length
-                    storage.save_content(person_name, url, content)
+                    items_to_save.append((url, content))
                     total_chars += len(content)
                     successful_scrapes += 1
-                    await ctx.debug(f"✅ Saved {len(content)} chars from {url}")
+                    await ctx.debug(f"✅ Saving {len(content)} chars from {url}")
                 else:
                     await ctx.debug(f"⏭️ Skipped {url} (insufficient content)")
 
             if successful_scrapes == 0:
                 return f"❌ Failed to scrape any content for {person_name}. URLs may be inaccessible."
 
+            storage.save_content_batch(person_name, items_to_save)
+
+            # Precompute keyword search data
+            _prepare_search_chunks(person_name)
+
+            # Build the semantic search index (optional)
+            if vector_search:
+                await ctx.info(f"🧮 Indexing content for semantic search...")
+                try:
+                    num_chunks = await asyncio.to_thread(
+                        vector_search.build_index,
+                        storage.get_vector_index_dir(person_name),
+                        storage.iter_content(person_name)
+                    )
+                    await ctx.debug(f"✅ Indexed {num_chunks} chunks")
+                except Exception as e:
+                    await ctx.warning(f"⚠️ Semantic indexing failed, using keyword search: {str(e)}")
+
             # Step 4: Set as current persona
-            state_manager.set_persona(person_name)
+            state_manager.set_persona(person_name, session=_get_session(ctx))
 
             return f"✅ {person_name} ready! Scraped {successful_scrapes}/{len(urls)} URLs ({total_chars:,} chars)"
 
@@ -119,7 +225,7 @@ The persona will respond in FIRST PERSON based on their actual public statements
         """
         try:
             # Check if a persona is set
-            current_persona = state_manager.get_persona()
+            current_persona = state_manager.get_persona(session=_get_session(ctx))
 
             if not current_persona:
                 return "❌ No persona is active. Please run init_persona first."
@@ -133,43 +239,83 @@ The persona will respond in FIRST PERSON based on their actual public statements
             anthropic_key = config.anthropic_api_key
 
             # Initialize LLM
-            llm = PersonaLLM(api_key=anthropic_key)
+            llm = _get_llm(anthropic_key)
+
+            # Reuse the answer if this question was already asked about the same content
+            content_version = storage.content_hash(current_persona)
+            cached_response = llm.get_cached_response(current_persona, question, content_version)
+            if cached_response is not None:
+                await ctx.debug(f"♻️ Returning cached response")
+                return cached_response
 
             # Load persona content
             await ctx.info(f"📚 Loading content for {current_persona}...")
-            content_chunks = storage.load_all_content(current_persona)
+            content_chunks = storage.load_chunks(current_persona)
+
+            if content_chunks is None:
+                # Persona stored before search data was precomputed
+                _prepare_search_chunks(current_persona)
+                content_chunks = storage.load_chunks(current_persona)
 
             if not content_chunks:
                 return f"❌ No content found for {current_persona}."
 
-            # Search for relevant chunks
+            # Search for relevant chunks (semantic if the persona has a vector index)
             await ctx.info(f"🔍 Searching for relevant context...")
-            relevant_chunks = simple_search.search(
-                question=question,
-                content_chunks=content_chunks,
-                top_k=3,
-                max_chars=4000
-            )
+            index_dir = storage.get_vector_index_dir(current_persona)
+            retrieval_score = None
+            if vector_search and vector_search.has_index(index_dir):
+                relevant_chunks = await asyncio.to_thread(
+                    vector_search.search,
+                    index_dir,
+                    question,
+                    top_k=3,
+                    max_chars=4000
+                )
+            else:
+                relevant_chunks, retrieval_score = simple_search.search_prepared_with_score(
+                    question=question,
+                    chunks=content_chunks,
+                    top_k=3,
+                    max_chars=4000,
+                    ignore_text=current_persona
+                )
 
             # Generate response
             await ctx.info(f"🤖 Generating response as {current_persona}...")
-            response = await llm.generate_response(
+            response_parts = []
+            pending = ""
+
+            async for text in llm.stream_response(
                 person_name=current_persona,
                 question=question,
-                context_chunks=relevant_chunks
-            )
+                context_chunks=relevant_chunks,
+                content_version=content_version,
+                retrieval_score=retrieval_score
+            ):
+                response_parts.append(text)
+                pending += text
+
+                # Forward partial output to the client roughly line by line
+                if "\n" in text or len(pending) >= STREAM_FLUSH_CHARS:
+                    if pending.strip():
+                        await ctx.info(pending)
+                    pending = ""
+
+            if pending.strip():
+                await ctx.info(pending)
 
-            return response
+            return "".join(response_parts)
 
         except Exception as e:
             return f"❌ Error generating response: {str(e)}"
 
     @server.tool()
-    def get_current_persona() -> str:
+    def get_current_persona(ctx: Context = None) -> str:
         """
         Get the name of the currently active persona.
         """
-        current = state_manager.get_persona()
+        current = state_manager.get_persona(session=_get_session(ctx))
 
         if current:
             stats = storage.get_persona_stats(current)
@@ -181,7 +327,7 @@ The persona will respond in FIRST PERSON based on their actual public statements
             return "❌ No persona is currently active"
 
     @server.tool()
-    def switch_persona(person_name: str) -> str:
+    def switch_persona(person_name: str, ctx: Context = None) -> str:
         """
         Switch to a different persona that has already been initialized.
 
@@ -193,7 +339,7 @@ The persona will respond in FIRST PERSON based on their actual public statements
             return f"❌ {person_name} hasn't been initialized yet. Use init_persona first."
 
         # Switch to the persona
-        state_manager.set_persona(person_name)
+        state_manager.set_persona(person_name, session=_get_session(ctx))
 
         stats = storage.get_persona_stats(person_name)
         return f"✅ Switched to {person_name}\n📊 {stats['num_documents']} documents, {stats['total_chars']:,} characters"
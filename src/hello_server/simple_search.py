@@ -6,8 +6,41 @@ relevant content chunks to answer questions. In the future, this will
 be replaced with vector embeddings (ChromaDB) for semantic search.
 """
 
+import heapq
 import re
-from typing import List, Tuple
+from collections import Counter
+from typing import Callable, Dict, List, Pattern, Set, Tuple
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+
+# Words of 3+ letters (punctuation and short words are dropped)
+_WORD_RE = re.compile(r'\b[a-z]{3,}\b')
+
+# Common stop words that carry no meaning for matching
+_STOP_WORDS: frozenset[str] = frozenset({
+    'the', 'and', 'for', 'are', 'but', 'not', 'you', 'all',
+    'can', 'her', 'was', 'one', 'our', 'out', 'day', 'get',
+    'has', 'him', 'his', 'how', 'man', 'new', 'now', 'old',
+    'see', 'two', 'way', 'who', 'boy', 'did', 'its', 'let',
+    'put', 'say', 'she', 'too', 'use', 'what', 'when', 'where',
+    'with', 'that', 'this', 'have', 'from', 'they', 'been',
+    'about', 'there', 'which', 'their', 'would', 'these',
+    'than', 'your'
+})
+
+
+# Questions with fewer distinct keywords than this give no confidence signal
+MIN_CONFIDENCE_KEYWORDS = 2
+
+
+def _is_word_char(char: str) -> bool:
+    """Check if a character counts as part of a word (same as regex \\w)."""
+    return char.isalnum() or char == "_"
 
 
 class SimpleSearch:
@@ -26,49 +59,76 @@ class SimpleSearch:
         Returns:
             List of keywords
         """
-        # Convert to lowercase
-        text = text.lower()
-
-        # Remove punctuation and split into words
-        words = re.findall(r'\b[a-z]{3,}\b', text)
+        return [w for w in _WORD_RE.findall(text.lower()) if w not in _STOP_WORDS]
 
-        # Filter out common stop words
-        stop_words = {
-            'the', 'and', 'for', 'are', 'but', 'not', 'you', 'all',
-            'can', 'her', 'was', 'one', 'our', 'out', 'day', 'get',
-            'has', 'him', 'his', 'how', 'man', 'new', 'now', 'old',
-            'see', 'two', 'way', 'who', 'boy', 'did', 'its', 'let',
-            'put', 'say', 'she', 'too', 'use', 'what', 'when', 'where',
-            'with', 'that', 'this', 'have', 'from', 'they', 'been',
-            'about', 'there', 'which', 'their', 'would', 'these',
-            'than', 'your'
-        }
+    def _build_pattern(self, keywords: List[str]) -> Pattern[str]:
+        """
+        Compile a single regex matching any of the keywords as a whole word.
 
-        keywords = [w for w in words if w not in stop_words]
+        Args:
+            keywords: List of keywords to match
 
-        return keywords
+        Returns:
+            Compiled alternation pattern
+        """
+        alternatives = "|".join(map(re.escape, dict.fromkeys(keywords)))
+        return re.compile(r'\b(' + alternatives + r')\b')
 
-    def _score_chunk(self, chunk: str, keywords: List[str]) -> float:
+    def _build_scorer(self, keywords: List[str]) -> Callable[[str], float]:
         """
-        Score a content chunk based on keyword matches.
+        Build a function that scores a lowercased chunk by whole-word keyword matches.
+
+        Uses an Aho-Corasick automaton when pyahocorasick is installed,
+        otherwise a single compiled regex.
 
         Args:
-            chunk: Content chunk to score
             keywords: List of keywords to match
 
         Returns:
-            Score (higher is better)
+            Scoring function (higher is better)
+        """
+        # Keywords repeated in the question count once per repetition
+        weights = Counter(keywords)
+
+        if AHOCORASICK_AVAILABLE:
+            automaton = ahocorasick.Automaton()
+            for keyword, weight in weights.items():
+                automaton.add_word(keyword, (len(keyword), weight))
+            automaton.make_automaton()
+
+            def score_with_automaton(chunk_lower: str) -> float:
+                score = 0
+                last_index = len(chunk_lower) - 1
+                for end, (length, weight) in automaton.iter(chunk_lower):
+                    start = end - length + 1
+                    # Only count whole-word matches
+                    if start > 0 and _is_word_char(chunk_lower[start - 1]):
+                        continue
+                    if end < last_index and _is_word_char(chunk_lower[end + 1]):
+                        continue
+                    score += weight
+                return float(score)
+
+            return score_with_automaton
+
+        pattern = self._build_pattern(keywords)
+
+        def score_with_regex(chunk_lower: str) -> float:
+            return float(sum(weights[match.group(1)] for match in pattern.finditer(chunk_lower)))
+
+        return score_with_regex
+
+    def prepare_chunk(self, text: str) -> Dict:
         """
-        chunk_lower = chunk.lower()
-        score = 0.0
+        Precompute search data for a content chunk at ingestion time.
 
-        for keyword in keywords:
-            # Count occurrences of each keyword
-            count = chunk_lower.count(keyword)
-            # Higher weight for more occurrences
-            score += count * 1.0
+        Args:
+            text: Content chunk text
 
-        return score
+        Returns:
+            Dictionary with 'text' and 'tokens' (sorted unique keywords) keys
+        """
+        return {"text": text, "tokens": sorted(set(self._extract_keywords(text)))}
 
     def search(
         self,
@@ -89,28 +149,105 @@ class SimpleSearch:
         Returns:
             List of relevant content chunks
         """
-        if not content_chunks:
-            return []
+        return self.search_prepared(
+            question,
+            [{"text": chunk} for chunk in content_chunks],
+            top_k=top_k,
+            max_chars=max_chars
+        )
+
+    def search_prepared(
+        self,
+        question: str,
+        chunks: List[Dict],
+        top_k: int = 3,
+        max_chars: int = 4000
+    ) -> List[str]:
+        """
+        Search for relevant content chunks using precomputed chunk data.
+
+        Each chunk has a 'text' key and optionally 'lower' (lowercased text)
+        and 'tokens' (set of keywords in the chunk). Missing fields are
+        computed on the fly.
+
+        Args:
+            question: The question to answer
+            chunks: List of prepared content chunks to search
+            top_k: Number of top chunks to return
+            max_chars: Maximum total characters to return
+
+        Returns:
+            List of relevant content chunks
+        """
+        relevant_chunks, _ = self.search_prepared_with_score(question, chunks, top_k, max_chars)
+        return relevant_chunks
+
+    def search_prepared_with_score(
+        self,
+        question: str,
+        chunks: List[Dict],
+        top_k: int = 3,
+        max_chars: int = 4000,
+        ignore_text: str = ""
+    ) -> Tuple[List[str], float]:
+        """
+        Search prepared chunks and report how well the best chunk matched.
+
+        The match confidence is the fraction of the question's distinct
+        keywords that appear in the best chunk, so it doesn't grow with
+        document length. Keywords from ignore_text (e.g. the persona's name,
+        which appears in nearly every document) don't count, and questions
+        with fewer than MIN_CONFIDENCE_KEYWORDS remaining keywords get 0.0.
+
+        Args:
+            question: The question to answer
+            chunks: List of prepared content chunks to search (see search_prepared)
+            top_k: Number of top chunks to return
+            max_chars: Maximum total characters to return
+            ignore_text: Text whose keywords are left out of the confidence
+
+        Returns:
+            Tuple of (relevant content chunks, match confidence between 0.0 and 1.0)
+        """
+        if not chunks:
+            return [], 0.0
 
         # Extract keywords from the question
         keywords = self._extract_keywords(question)
 
         if not keywords:
             # If no keywords, return first few chunks
-            return content_chunks[:top_k]
+            return [chunk["text"] for chunk in chunks[:top_k]], 0.0
+
+        keyword_set = set(keywords)
+        score_chunk = self._build_scorer(keywords)
 
-        # Score each chunk
-        scored_chunks: List[Tuple[float, str]] = []
+        # Score each chunk in a single pass over its text, skipping non-matches
+        scored_chunks: List[Tuple[float, Dict]] = []
 
-        for chunk in content_chunks:
-            score = self._score_chunk(chunk, keywords)
-            scored_chunks.append((score, chunk))
+        for chunk in chunks:
+            # Cheap pre-filter: skip chunks that contain none of the keywords
+            tokens = chunk.get("tokens")
+            if tokens is not None and keyword_set.isdisjoint(tokens):
+                continue
 
-        # Sort by score (highest first)
-        scored_chunks.sort(reverse=True, key=lambda x: x[0])
+            chunk_lower = chunk.get("lower")
+            if chunk_lower is None:
+                chunk_lower = chunk["text"].lower()
 
-        # Take top_k chunks
-        top_chunks = [chunk for score, chunk in scored_chunks[:top_k]]
+            score = score_chunk(chunk_lower)
+            if score > 0:
+                scored_chunks.append((score, chunk))
+
+        if scored_chunks:
+            # Take top_k chunks (highest score first, ties keep original order)
+            top_scored = heapq.nlargest(top_k, scored_chunks, key=lambda x: x[0])
+            top_chunks = [chunk["text"] for score, chunk in top_scored]
+            confidence = self._match_confidence(keyword_set, top_scored[0][1], ignore_text)
+        else:
+            # Nothing matched, fall back to the first few chunks
+            top_chunks = [chunk["text"] for chunk in chunks[:top_k]]
+            confidence = 0.0
 
         # Limit total characters
         total_chars = 0
@@ -127,4 +264,26 @@ class SimpleSearch:
                     limited_chunks.append(chunk[:remaining])
                 break
 
-        return limited_chunks
+        return limited_chunks, confidence
+
+    def _match_confidence(self, keyword_set: Set[str], chunk: Dict, ignore_text: str) -> float:
+        """
+        Get the fraction of distinct question keywords found in a chunk.
+
+        Args:
+            keyword_set: Distinct keywords of the question
+            chunk: Prepared content chunk
+            ignore_text: Text whose keywords are left out
+
+        Returns:
+            Fraction between 0.0 and 1.0, or 0.0 if too few keywords remain
+        """
+        keywords = keyword_set.difference(self._extract_keywords(ignore_text))
+        if len(keywords) < MIN_CONFIDENCE_KEYWORDS:
+            return 0.0
+
+        tokens = chunk.get("tokens")
+        if tokens is None:
+            tokens = self._extract_keywords(chunk.get("lower") or chunk["text"])
+
+        return len(keywords.intersection(tokens)) / len(keywords)
@@ -1,45 +1,69 @@
 """
 Persona state manager.
 
-Keeps track of the currently active persona across sessions.
+Keeps track of the currently active persona for each client session.
 """
 
 from typing import Optional
+from weakref import WeakKeyDictionary
 
 
 class PersonaStateManager:
-    """Manages the currently active persona."""
+    """Manages the currently active persona per session."""
 
     def __init__(self):
+        # Active persona per session object, dropped when the session goes away
+        self._session_personas: WeakKeyDictionary = WeakKeyDictionary()
+        # Active persona for callers without a session
         self.current_persona: Optional[str] = None
 
-    def set_persona(self, person_name: str):
+    def set_persona(self, person_name: str, session: Optional[object] = None):
         """
         Set the currently active persona.
 
         Args:
             person_name: Name of the persona to activate
+            session: Client session to set the persona for (None for the shared default)
         """
-        self.current_persona = person_name
+        if session is None:
+            self.current_persona = person_name
+        else:
+            self._session_personas[session] = person_name
 
-    def get_persona(self) -> Optional[str]:
+    def get_persona(self, session: Optional[object] = None) -> Optional[str]:
         """
         Get the currently active persona.
 
+        Args:
+            session: Client session to get the persona for (None for the shared default)
+
         Returns:
             Name of the current persona, or None if no persona is set
         """
-        return self.current_persona
+        if session is None:
+            return self.current_persona
+        return self._session_personas.get(session)
 
-    def has_persona(self) -> bool:
+    def has_persona(self, session: Optional[object] = None) -> bool:
         """
         Check if a persona is currently set.
 
+        Args:
+            session: Client session to check (None for the shared default)
+
         Returns:
             True if a persona is active, False otherwise
         """
-        return self.current_persona is not None
+        return self.get_persona(session) is not None
 
-    def clear_persona(self):
-        """Clear the currently active persona."""
-        self.current_persona = None
+    def clear_persona(self, session: Optional[object] = None):
+        """
+        Clear the currently active persona.
+
+        Args:
+            session: Client session to clear the persona for (None for the shared default)
+        """
+        if session is None:
+            self.current_persona = None
+        else:
+            self._session_personas.pop(session, None)
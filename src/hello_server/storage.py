@@ -5,35 +5,369 @@ Handles saving and loading scraped content to/from disk.
 """
 
 import hashlib
-import json
+import mmap
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+import orjson
+import zstandard
+from xxhash import xxh3_64_hexdigest
+
+
+# Content file extensions (current first, then legacy)
+CONTENT_SUFFIXES = (".zst", ".txt")
+
+# Metadata backends: append-only JSONL log, or an SQLite index for large personas
+METADATA_BACKENDS = ("jsonl", "sqlite")
+
+# Shared content-addressed object store, relative to the base directory
+OBJECTS_DIR = "_objects"
+
+# zstd level for stored content (fast, ~3-5x on scraped text)
+ZSTD_LEVEL = 3
+
+# Block size for raw content file reads (larger files are memory-mapped)
+READ_BLOCK_SIZE = 64 * 1024
+
+# Flags for opening content files with os.open (binary, not inherited)
+_READ_FLAGS = os.O_RDONLY | getattr(os, "O_BINARY", 0) | getattr(os, "O_CLOEXEC", 0)
+
+# Lowercases ASCII letters and maps spaces to underscores in one pass
+_NORMALIZE_NAME = str.maketrans(
+    {**{c: c + 32 for c in range(ord("A"), ord("Z") + 1)}, ord(" "): ord("_")}
+)
+
+# zstd contexts can't be shared between threads, so keep one per thread
+_zstd_local = threading.local()
+
+
+def _compress(data: bytes) -> bytes:
+    """Compress bytes with this thread's zstd compressor."""
+    compressor = getattr(_zstd_local, "compressor", None)
+    if compressor is None:
+        compressor = _zstd_local.compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+    return compressor.compress(data)
+
+
+def _decompress(data: bytes) -> bytes:
+    """Decompress bytes with this thread's zstd decompressor."""
+    decompressor = getattr(_zstd_local, "decompressor", None)
+    if decompressor is None:
+        decompressor = _zstd_local.decompressor = zstandard.ZstdDecompressor()
+    return decompressor.decompress(data)
+
+
+def _decode_content(path: str, data) -> str:
+    """Decode raw content file data (bytes or a mapping) to text."""
+    if path.endswith(".zst"):
+        data = _decompress(data)
+    return str(data, "utf-8")
+
+
+def _read_content_file(path: str) -> str:
+    """
+    Read a content file as text.
+
+    Content is stored as zstd-compressed UTF-8 (.zst); plain .txt files
+    written by older versions are read as-is.
+
+    Reads use raw os-level calls, skipping the buffered file object's extra
+    fstat/ioctl/lseek syscalls: small files take one open, two reads and a
+    close. Files larger than one block are memory-mapped and decoded
+    straight from the page cache instead of being copied into a buffer.
+    """
+    fd = os.open(path, _READ_FLAGS)
+    try:
+        block = os.read(fd, READ_BLOCK_SIZE)
+
+        if len(block) == READ_BLOCK_SIZE:
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mapped:
+                return _decode_content(path, mapped)
+
+        blocks = [block]
+        while block:
+            block = os.read(fd, READ_BLOCK_SIZE)
+            blocks.append(block)
+    finally:
+        os.close(fd)
+
+    return _decode_content(path, b"".join(blocks))
+
+
+def _read_content_file_if_exists(path: str) -> Optional[str]:
+    """Read a content file as text, or return None if it doesn't exist."""
+    try:
+        return _read_content_file(path)
+    except FileNotFoundError:
+        return None
+
+
+def _read_content_files(paths: List[str]) -> List[Optional[str]]:
+    """
+    Read several content files, in parallel when there is more than one.
+
+    Args:
+        paths: Content file paths
+
+    Returns:
+        Content strings in the same order as paths (None for missing files)
+    """
+    if len(paths) <= 1:
+        return [_read_content_file_if_exists(path) for path in paths]
+
+    # Read files in parallel (file reads and decompression release the GIL)
+    with ThreadPoolExecutor(max_workers=min(32, len(paths))) as executor:
+        return list(executor.map(_read_content_file_if_exists, paths))
 
 
 class PersonaStorage:
     """Manages file-based storage for persona knowledge bases."""
 
-    def __init__(self, base_dir: str = "./knowledge_base"):
+    def __init__(self, base_dir: str = "./knowledge_base", metadata_backend: str = "jsonl"):
+        if metadata_backend not in METADATA_BACKENDS:
+            raise ValueError(f"Unknown metadata backend: {metadata_backend}")
+
         self.base_dir = Path(base_dir)
         self.base_dir.mkdir(exist_ok=True)
+        self.metadata_backend = metadata_backend
+        # Loaded search chunks, keyed by persona directory
+        self._chunks_cache: Dict[Path, List[Dict]] = {}
+        # Directories already created, keyed by person name
+        self._ensured: Dict[str, Path] = {}
+        self._content_ensured: Dict[str, Path] = {}
+        self._shards_ensured: Set[Path] = set()
+        # Loaded metadata, keyed by metadata file path
+        self._meta_cache: Dict[Path, Dict] = {}
+        # Knowledge base statistics, keyed by metadata file path
+        self._stats_cache: Dict[Path, Dict] = {}
+        # Content version digests (see content_hash), keyed by metadata file path
+        self._version_cache: Dict[Path, str] = {}
+        # Open SQLite metadata connections, keyed by person name
+        self._connections: Dict[str, sqlite3.Connection] = {}
+
+    def _persona_dir_readonly(self, person_name: str) -> Path:
+        """Get the directory path for a specific persona without creating it."""
+        persona_dir = self._ensured.get(person_name)
+
+        if persona_dir is None:
+            # Normalize the person name to a valid directory name
+            if person_name.isascii():
+                normalized_name = person_name.translate(_NORMALIZE_NAME)
+            else:
+                # Full Unicode lowercasing keeps existing non-ASCII directory names
+                normalized_name = person_name.lower().replace(" ", "_")
+            persona_dir = self.base_dir / normalized_name
+
+        return persona_dir
 
     def _get_persona_dir(self, person_name: str) -> Path:
-        """Get the directory path for a specific persona."""
-        # Normalize the person name to a valid directory name
-        normalized_name = person_name.lower().replace(" ", "_")
-        persona_dir = self.base_dir / normalized_name
-        persona_dir.mkdir(exist_ok=True)
+        """Get the directory path for a specific persona, creating it if needed."""
+        persona_dir = self._ensured.get(person_name)
+
+        if persona_dir is None:
+            persona_dir = self._persona_dir_readonly(person_name)
+            persona_dir.mkdir(exist_ok=True)
+            self._ensured[person_name] = persona_dir
+
         return persona_dir
 
     def _get_content_dir(self, person_name: str) -> Path:
         """Get the content directory for a specific persona."""
-        content_dir = self._get_persona_dir(person_name) / "content"
-        content_dir.mkdir(exist_ok=True)
+        content_dir = self._content_ensured.get(person_name)
+
+        if content_dir is None:
+            content_dir = self._get_persona_dir(person_name) / "content"
+            content_dir.mkdir(exist_ok=True)
+            self._content_ensured[person_name] = content_dir
+
         return content_dir
 
+    def _get_shard_dir(self, content_dir: Path, url_hash: str) -> Path:
+        """Get the subdirectory for a hash (first two hex chars, 256-way fanout)."""
+        shard_dir = content_dir / url_hash[:2]
+
+        if shard_dir not in self._shards_ensured:
+            shard_dir.mkdir(parents=True, exist_ok=True)
+            self._shards_ensured.add(shard_dir)
+
+        return shard_dir
+
+    def _get_object_path(self, object_hash: str) -> Path:
+        """Get the path of an object in the shared object store."""
+        return self.base_dir / OBJECTS_DIR / object_hash[:2] / f"{object_hash}.zst"
+
+    def _release_object(self, object_hash: str):
+        """
+        Delete an object from the shared store once no persona links to it.
+
+        Called after a persona's link to the object has been replaced; the
+        store's own entry is the only remaining link when st_nlink is 1.
+        """
+        object_path = self._get_object_path(object_hash)
+        try:
+            if os.stat(object_path).st_nlink == 1:
+                object_path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _store_object(self, data: bytes) -> Tuple[str, Path, Optional[bytes]]:
+        """
+        Store content in the shared content-addressed object store.
+
+        Objects live in _objects/<ab>/<hash>.zst, keyed by the BLAKE2b hash of
+        the uncompressed content, so identical content is stored once no
+        matter how many personas or URLs it was scraped for.
+
+        Args:
+            data: UTF-8 encoded content
+
+        Returns:
+            Tuple of (content hash, object path, compressed data or None if
+            the object already existed)
+        """
+        object_hash = hashlib.blake2b(data, digest_size=16).hexdigest()
+        object_path = self._get_object_path(object_hash)
+        self._get_shard_dir(self.base_dir / OBJECTS_DIR, object_hash)
+
+        if object_path.exists():
+            return object_hash, object_path, None
+
+        compressed = _compress(data)
+        # Write under a temporary name so a crash never leaves a truncated object
+        tmp_path = object_path.with_suffix(".tmp")
+        tmp_path.write_bytes(compressed)
+        os.replace(tmp_path, object_path)
+
+        return object_hash, object_path, compressed
+
+    def get_vector_index_dir(self, person_name: str) -> Path:
+        """Get the vector index directory for a specific persona."""
+        return self._persona_dir_readonly(person_name) / "vectors"
+
     def _get_metadata_path(self, person_name: str) -> Path:
-        """Get the metadata file path for a specific persona."""
-        return self._get_persona_dir(person_name) / "metadata.json"
+        """Get the metadata log file path for a specific persona."""
+        return self._persona_dir_readonly(person_name) / "metadata.jsonl"
+
+    def _get_legacy_metadata_path(self, person_name: str) -> Path:
+        """Get the path of the metadata file used by older versions."""
+        return self._persona_dir_readonly(person_name) / "metadata.json"
+
+    def _get_metadata_db_path(self, person_name: str) -> Path:
+        """Get the SQLite metadata index path for a specific persona."""
+        return self._persona_dir_readonly(person_name) / "meta.db"
+
+    def _get_connection(self, person_name: str) -> sqlite3.Connection:
+        """
+        Get the SQLite metadata connection for a persona, opening it on first use.
+
+        The JSONL log stays the source of truth and the database is an index
+        over it. On open, the index re-imports the log if it changed since
+        the last sync (e.g. records added while running with the JSONL backend).
+        """
+        connection = self._connections.get(person_name)
+
+        if connection is None:
+            self._get_persona_dir(person_name)
+            connection = sqlite3.connect(self._get_metadata_db_path(person_name))
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS meta ("
+                "url_hash TEXT PRIMARY KEY, url TEXT, char_count INTEGER, file TEXT, content_hash TEXT)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS meta_url ON meta (url)")
+            # Size of the JSONL log when the index was last synced with it
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS meta_sync (id INTEGER PRIMARY KEY CHECK (id = 0), log_size INTEGER)"
+            )
+
+            row = connection.execute("SELECT log_size FROM meta_sync WHERE id = 0").fetchone()
+            if row is None or row[0] != self._get_metadata_log_size(person_name):
+                # Loading may migrate legacy metadata or repair the log, so size it afterwards
+                self._upsert_metadata_rows(connection, self._load_metadata(person_name))
+                self._set_synced_log_size(connection, self._get_metadata_log_size(person_name))
+                self._stats_cache.pop(self._get_metadata_path(person_name), None)
+
+            connection.commit()
+            self._connections[person_name] = connection
+
+        return connection
+
+    def _get_metadata_log_size(self, person_name: str) -> int:
+        """Get the size in bytes of a persona's metadata log (0 if it doesn't exist)."""
+        try:
+            return os.stat(self._get_metadata_path(person_name)).st_size
+        except OSError:
+            return 0
+
+    @staticmethod
+    def _set_synced_log_size(connection: sqlite3.Connection, log_size: int):
+        """Record the metadata log size an SQLite index is in sync with."""
+        connection.execute(
+            "INSERT INTO meta_sync (id, log_size) VALUES (0, ?) "
+            "ON CONFLICT (id) DO UPDATE SET log_size = excluded.log_size",
+            (log_size,)
+        )
+
+    @staticmethod
+    def _upsert_metadata_rows(connection: sqlite3.Connection, records: Dict[str, Dict]):
+        """
+        Add or update metadata records in an SQLite index.
+
+        Updates happen in place, so rows keep their rowid and URL order
+        matches the JSONL backend.
+        """
+        connection.executemany(
+            "INSERT INTO meta (url_hash, url, char_count, file, content_hash) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (url_hash) DO UPDATE SET url = excluded.url, char_count = excluded.char_count, "
+            "file = excluded.file, content_hash = excluded.content_hash",
+            [
+                (
+                    url_hash,
+                    record.get("url", ""),
+                    record.get("char_count", 0),
+                    record.get("file"),
+                    record.get("content_hash")
+                )
+                for url_hash, record in records.items()
+            ]
+        )
+
+    def _get_record(self, person_name: str, url_hash: str) -> Optional[Dict]:
+        """Get the metadata record for a content ID, or None if there isn't one."""
+        if self.metadata_backend == "sqlite":
+            row = self._get_connection(person_name).execute(
+                "SELECT url, char_count, file, content_hash FROM meta WHERE url_hash = ?",
+                (url_hash,)
+            ).fetchone()
+            if row is None:
+                return None
+            return {"url": row[0], "char_count": row[1], "file": row[2], "content_hash": row[3]}
+
+        return self._load_metadata(person_name).get(url_hash)
+
+    def _get_url_hash(self, person_name: str, url: str) -> str:
+        """
+        Get the content ID for a URL.
+
+        IDs are 64-bit xxHash3 hex digests. URLs saved by older versions keep
+        their truncated SHA-256 ID so re-saving them replaces the existing file.
+        """
+        url_bytes = url.encode()
+        url_hash = xxh3_64_hexdigest(url_bytes)
+
+        if self._get_record(person_name, url_hash) is None:
+            legacy_hash = hashlib.sha256(url_bytes).hexdigest()[:16]
+            if self._get_record(person_name, legacy_hash) is not None:
+                return legacy_hash
+
+        return url_hash
 
     def save_content(self, person_name: str, url: str, content: str) -> str:
         """
@@ -47,24 +381,129 @@ class PersonaStorage:
         Returns:
             The hash ID of the saved content
         """
-        # Create a hash of the URL for the filename
-        url_hash = hashlib.sha256(url.encode()).hexdigest()[:16]
+        return self.save_content_batch(person_name, [(url, content)])[0]
 
-        # Save the content
+    def save_content_batch(self, person_name: str, items: List[Tuple[str, str]]) -> List[str]:
+        """
+        Save several scraped pages to disk, updating metadata once.
+
+        Args:
+            person_name: Name of the persona
+            items: List of (url, content) pairs
+
+        Returns:
+            The hash IDs of the saved content, in the same order as items
+        """
         content_dir = self._get_content_dir(person_name)
-        content_file = content_dir / f"{url_hash}.txt"
-        content_file.write_text(content, encoding="utf-8")
+        url_hashes = []
+        records = {}
+
+        for url, content in items:
+            # Create a hash of the URL for the filename
+            url_hash = self._get_url_hash(person_name, url)
+
+            # Later items for the same URL in this batch replace earlier ones
+            previous = records.get(url_hash) or self._get_record(person_name, url_hash)
+
+            # Save the content as a hard link to the shared object
+            data = content.encode("utf-8")
+            object_hash, object_path, compressed = self._store_object(data)
+
+            shard = url_hash[:2]
+            content_file = self._get_shard_dir(content_dir, url_hash) / f"{url_hash}.zst"
+            # Never write through an existing file: it may be linked to an object
+            content_file.unlink(missing_ok=True)
+            try:
+                os.link(object_path, content_file)
+            except OSError:
+                # Hard links unsupported (e.g. across filesystems), store a copy
+                content_file.write_bytes(compressed if compressed is not None else _compress(data))
+
+            relative_file = f"content/{shard}/{url_hash}.zst"
+            if previous and (previous.get("file") or relative_file) != relative_file:
+                # Drop the copy written by older versions (unsharded or uncompressed)
+                (self._get_persona_dir(person_name) / previous["file"]).unlink(missing_ok=True)
+
+            if previous and previous.get("content_hash") not in (None, object_hash):
+                self._release_object(previous["content_hash"])
+
+            url_hashes.append(url_hash)
+            records[url_hash] = {
+                "url": url,
+                "char_count": len(content),
+                "file": relative_file,
+                "content_hash": object_hash
+            }
 
         # Update metadata
-        metadata = self._load_metadata(person_name)
-        metadata[url_hash] = {
-            "url": url,
-            "char_count": len(content),
-            "file": f"content/{url_hash}.txt"
-        }
-        self._save_metadata(person_name, metadata)
+        if records:
+            self._append_metadata(person_name, records)
 
-        return url_hash
+        return url_hashes
+
+    def _list_content_files(self, person_name: str) -> List[str]:
+        """List the paths of all content files for a persona."""
+        # Read-only lookup: loading never creates directories
+        content_dir = self._content_ensured.get(person_name)
+        if content_dir is None:
+            content_dir = self._persona_dir_readonly(person_name) / "content"
+
+        paths = []
+        shard_dirs = []
+
+        try:
+            entries = os.scandir(content_dir)
+        except FileNotFoundError:
+            return []
+
+        # Content lives in content/<ab>/<hash>.zst; older versions wrote
+        # content/<ab>/<hash>.txt or content/<hash>.txt
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    shard_dirs.append(entry.path)
+                elif entry.name.endswith(CONTENT_SUFFIXES) and entry.is_file(follow_symlinks=False):
+                    paths.append(entry.path)
+
+        for shard_dir in shard_dirs:
+            with os.scandir(shard_dir) as entries:
+                paths.extend(
+                    entry.path
+                    for entry in entries
+                    if entry.name.endswith(CONTENT_SUFFIXES) and entry.is_file(follow_symlinks=False)
+                )
+
+        return paths
+
+    def iter_content(self, person_name: str) -> Iterator[str]:
+        """
+        Iterate over a persona's content one document at a time.
+
+        Only one document is held in memory at once, so prefer this over
+        load_all_content when the content is consumed in a single pass.
+
+        Args:
+            person_name: Name of the persona
+
+        Yields:
+            Content strings
+        """
+        for _, text in self.iter_content_items(person_name):
+            yield text
+
+    def iter_content_items(self, person_name: str) -> Iterator[Tuple[str, str]]:
+        """
+        Iterate over a persona's content along with where each document is stored.
+
+        Args:
+            person_name: Name of the persona
+
+        Yields:
+            Tuples of (file path relative to the persona directory, content string)
+        """
+        persona_dir = self._persona_dir_readonly(person_name)
+        for path in self._list_content_files(person_name):
+            yield Path(path).relative_to(persona_dir).as_posix(), _read_content_file(path)
 
     def load_all_content(self, person_name: str) -> List[str]:
         """
@@ -76,53 +515,300 @@ class PersonaStorage:
         Returns:
             List of content strings
         """
-        content_dir = self._get_content_dir(person_name)
+        texts = _read_content_files(self._list_content_files(person_name))
+        return [text for text in texts if text is not None]
 
-        if not content_dir.exists():
-            return []
+    def _get_chunks_path(self, person_name: str) -> Path:
+        """Get the precomputed search chunks file path for a specific persona."""
+        return self._persona_dir_readonly(person_name) / "search_chunks.json"
+
+    def save_chunks(self, person_name: str, chunks: List[Dict]):
+        """
+        Save precomputed search chunks for a persona.
+
+        Only each chunk's keywords and content file are saved; the text
+        itself stays in the (compressed, deduplicated) content store.
+
+        Args:
+            person_name: Name of the persona
+            chunks: Chunks with 'file' (see iter_content_items) and 'tokens'
+                (see SimpleSearch.prepare_chunk) keys
+        """
+        self._get_persona_dir(person_name)
+        chunks_path = self._get_chunks_path(person_name)
+
+        chunks_path.write_bytes(orjson.dumps(
+            [{"file": chunk["file"], "tokens": chunk["tokens"]} for chunk in chunks]
+        ))
+
+        self._chunks_cache.pop(chunks_path, None)
+
+    def load_chunks(self, person_name: str) -> Optional[List[Dict]]:
+        """
+        Load precomputed search chunks for a persona.
+
+        Chunk text is read from the content store and kept in memory with
+        lowercased text and keyword sets, ready for SimpleSearch.search_prepared.
+
+        Args:
+            person_name: Name of the persona
+
+        Returns:
+            List of chunks, or None if no chunks have been saved
+        """
+        chunks_path = self._get_chunks_path(person_name)
+
+        if chunks_path not in self._chunks_cache:
+            if not chunks_path.exists():
+                return None
 
-        contents = []
-        for content_file in content_dir.glob("*.txt"):
-            text = content_file.read_text(encoding="utf-8")
-            contents.append(text)
+            chunks = []
+            saved_chunks = orjson.loads(chunks_path.read_bytes())
 
-        return contents
+            # Read chunk text from the content store in parallel (older
+            # versions stored the text in the chunks file itself)
+            persona_dir = self._persona_dir_readonly(person_name)
+            to_read = [chunk for chunk in saved_chunks if "text" not in chunk]
+            texts = _read_content_files([str(persona_dir / chunk["file"]) for chunk in to_read])
+            for chunk, text in zip(to_read, texts):
+                chunk["text"] = text
+
+            for chunk in saved_chunks:
+                if chunk["text"] is None:
+                    # Content file no longer exists
+                    continue
+
+                chunk["lower"] = chunk["text"].lower()
+                chunk["tokens"] = frozenset(chunk.get("tokens", ()))
+                chunks.append(chunk)
+
+            self._chunks_cache[chunks_path] = chunks
+
+        return self._chunks_cache[chunks_path]
 
     def _load_metadata(self, person_name: str) -> Dict:
-        """Load metadata for a persona."""
+        """
+        Load metadata for a persona.
+
+        Metadata is an append-only log of {url_hash: record} lines where later
+        lines win. It is read once and then served from memory. Personas
+        stored in the older single metadata.json file are migrated on first load.
+        """
         metadata_path = self._get_metadata_path(person_name)
 
+        if metadata_path in self._meta_cache:
+            return self._meta_cache[metadata_path]
+
+        metadata = {}
+
         if metadata_path.exists():
-            with open(metadata_path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            torn = False
+            with open(metadata_path, "rb") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        metadata.update(orjson.loads(line))
+                    except orjson.JSONDecodeError:
+                        # Torn line from an interrupted write
+                        torn = True
+
+            if torn:
+                # Rewrite the log so new records aren't appended to the broken line
+                self._save_metadata(person_name, metadata)
+        else:
+            legacy_path = self._get_legacy_metadata_path(person_name)
+            if legacy_path.exists():
+                metadata = orjson.loads(legacy_path.read_bytes())
+                self._save_metadata(person_name, metadata)
+
+        self._meta_cache[metadata_path] = metadata
+        return metadata
+
+    def _append_metadata(self, person_name: str, records: Dict[str, Dict]):
+        """
+        Add or replace metadata records by appending them to the log in one write.
+
+        With the SQLite backend the records are also upserted into the index,
+        and the log is appended to without being loaded into memory.
+        """
+        self._get_persona_dir(person_name)
+        metadata_path = self._get_metadata_path(person_name)
+        self._version_cache.pop(metadata_path, None)
+        stats = self._stats_cache.get(metadata_path)
+        prefix = b""
+
+        if self.metadata_backend == "sqlite":
+            connection = self._get_connection(person_name)
+            # Only keep in-memory metadata in sync if something already loaded it
+            metadata = self._meta_cache.get(metadata_path)
+            if metadata is None:
+                prefix = self._get_log_separator(metadata_path)
+        else:
+            connection = None
+            metadata = self._load_metadata(person_name)
+
+        for url_hash, record in records.items():
+            if metadata is not None:
+                previous = metadata.get(url_hash)
+                metadata[url_hash] = record
+            else:
+                previous = self._get_record(person_name, url_hash)
 
-        return {}
+            # Keep cached statistics in sync (the URL is fixed for a given hash)
+            if stats is not None:
+                stats["total_chars"] += record.get("char_count", 0)
+                if previous is None:
+                    stats["num_documents"] += 1
+                    stats["urls"].append(record.get("url", ""))
+                else:
+                    stats["total_chars"] -= previous.get("char_count", 0)
+
+        with open(metadata_path, "ab") as f:
+            f.write(prefix + b"".join(
+                orjson.dumps({url_hash: record}) + b"\n" for url_hash, record in records.items()
+            ))
+            log_size = f.tell()
+
+        if connection is not None:
+            self._upsert_metadata_rows(connection, records)
+            self._set_synced_log_size(connection, log_size)
+            connection.commit()
+
+    @staticmethod
+    def _get_log_separator(metadata_path: Path) -> bytes:
+        """
+        Get what to write before appending to a log that hasn't been loaded.
+
+        Returns a newline if the log ends in a torn line, so new records
+        start on a line of their own.
+        """
+        try:
+            with open(metadata_path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                return b"" if f.read(1) == b"\n" else b"\n"
+        except OSError:
+            # Missing or empty log
+            return b""
 
     def _save_metadata(self, person_name: str, metadata: Dict):
-        """Save metadata for a persona."""
+        """
+        Rewrite the whole metadata log for a persona (one line per record).
+
+        The log is serialized once, written to a temporary file and renamed
+        over the old one, so a crash never leaves it half-written.
+        """
+        self._get_persona_dir(person_name)
+        metadata_path = self._get_metadata_path(person_name)
+
+        data = b"".join(orjson.dumps({url_hash: record}) + b"\n" for url_hash, record in metadata.items())
+        tmp_path = metadata_path.with_suffix(".jsonl.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, metadata_path)
+
+        self._meta_cache[metadata_path] = metadata
+        self._stats_cache.pop(metadata_path, None)
+        self._version_cache.pop(metadata_path, None)
+
+        # Keep an already open SQLite index in sync (new ones sync when opened)
+        connection = self._connections.get(person_name)
+        if connection is not None:
+            self._upsert_metadata_rows(connection, metadata)
+            self._set_synced_log_size(connection, len(data))
+            connection.commit()
+
+    def content_hash(self, person_name: str) -> str:
+        """
+        Get a short hash identifying the current version of a persona's content.
+
+        Changes whenever content is added or re-saved with different text.
+        Computed once and then cached until the metadata changes.
+        """
         metadata_path = self._get_metadata_path(person_name)
+        version = self._version_cache.get(metadata_path)
+        if version is not None:
+            return version
+
+        if self.metadata_backend == "sqlite":
+            rows = self._get_connection(person_name).execute(
+                "SELECT url_hash, content_hash, char_count FROM meta ORDER BY url_hash"
+            )
+        else:
+            metadata = self._load_metadata(person_name)
+            rows = (
+                (url_hash, metadata[url_hash].get("content_hash"), metadata[url_hash].get("char_count", 0))
+                for url_hash in sorted(metadata)
+            )
 
-        with open(metadata_path, "w", encoding="utf-8") as f:
-            json.dump(metadata, f, indent=2)
+        digest = hashlib.blake2b(digest_size=8)
+        for url_hash, object_hash, char_count in rows:
+            # Records written before content hashing fall back to their size
+            digest.update(f"{url_hash}:{object_hash or char_count};".encode("utf-8"))
+
+        version = digest.hexdigest()
+        self._version_cache[metadata_path] = version
+        return version
 
     def persona_exists(self, person_name: str) -> bool:
-        """Check if a persona has been initialized."""
-        persona_dir = self._get_persona_dir(person_name)
+        """Check if a persona has been initialized (without creating any directories)."""
         metadata_path = self._get_metadata_path(person_name)
 
-        return persona_dir.exists() and metadata_path.exists()
+        # Metadata already loaded with records means the log is on disk
+        if self._meta_cache.get(metadata_path) or person_name in self._connections:
+            return True
+
+        for path in (metadata_path, self._get_legacy_metadata_path(person_name)):
+            try:
+                os.stat(path)
+                return True
+            except OSError:
+                pass
+
+        return False
 
     def get_persona_stats(self, person_name: str) -> Dict:
-        """Get statistics about a persona's knowledge base."""
+        """
+        Get statistics about a persona's knowledge base.
+
+        Statistics are computed once per process and then kept up to date by
+        save_content, so repeated calls don't rescan the metadata. With the
+        SQLite backend the first computation is an index query instead of
+        a full read of the metadata log.
+        """
         if not self.persona_exists(person_name):
             return {"exists": False}
 
-        metadata = self._load_metadata(person_name)
-        total_chars = sum(item.get("char_count", 0) for item in metadata.values())
+        metadata_path = self._get_metadata_path(person_name)
+        stats = self._stats_cache.get(metadata_path)
+
+        if stats is None and self.metadata_backend == "sqlite":
+            connection = self._get_connection(person_name)
+            num_documents, total_chars = connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(char_count), 0) FROM meta"
+            ).fetchone()
+            stats = {
+                "exists": True,
+                "num_documents": num_documents,
+                "total_chars": total_chars,
+                "urls": [row[0] for row in connection.execute("SELECT url FROM meta ORDER BY rowid")]
+            }
+            self._stats_cache[metadata_path] = stats
+
+        if stats is None:
+            metadata = self._load_metadata(person_name)
+            total_chars = 0
+            urls = []
+
+            for item in metadata.values():
+                total_chars += item.get("char_count", 0)
+                urls.append(item.get("url", ""))
+
+            stats = {
+                "exists": True,
+                "num_documents": len(metadata),
+                "total_chars": total_chars,
+                "urls": urls
+            }
+            self._stats_cache[metadata_path] = stats
 
-        return {
-            "exists": True,
-            "num_documents": len(metadata),
-            "total_chars": total_chars,
-            "urls": [item.get("url", "") for item in metadata.values()]
-        }
+        return {**stats, "urls": list(stats["urls"])}
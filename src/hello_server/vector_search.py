@@ -0,0 +1,184 @@
+"""
+Semantic search for content retrieval using vector embeddings.
+
+Splits persona content into small chunks, embeds them with a
+sentence-transformer model and indexes them with FAISS. This is an
+optional backend: without sentence-transformers and faiss installed,
+the server keeps using keyword search (SimpleSearch).
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+try:
+    import faiss
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+    VECTOR_SEARCH_AVAILABLE = True
+except ImportError:
+    VECTOR_SEARCH_AVAILABLE = False
+
+
+INDEX_FILE = "vectors.faiss"
+CHUNKS_FILE = "chunks.json"
+
+
+class VectorSearch:
+    """Embedding-based semantic search engine for content retrieval."""
+
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", chunk_size: int = 500):
+        self.model_name = model_name
+        self.chunk_size = chunk_size
+        self._model = None
+        # Loaded indexes keyed by index directory
+        self._indexes: Dict[str, Tuple["faiss.Index", List[str]]] = {}
+
+    def _get_model(self) -> "SentenceTransformer":
+        """Load the embedding model on first use."""
+        if self._model is None:
+            self._model = SentenceTransformer(self.model_name)
+        return self._model
+
+    def _embed(self, texts: List[str]) -> "np.ndarray":
+        """Embed texts as normalized float32 vectors (inner product = cosine similarity)."""
+        embeddings = self._get_model().encode(
+            texts,
+            normalize_embeddings=True,
+            convert_to_numpy=True
+        )
+        return np.ascontiguousarray(embeddings, dtype=np.float32)
+
+    def _chunk_text(self, text: str) -> List[str]:
+        """
+        Split text into chunks of roughly chunk_size characters on line boundaries.
+
+        Args:
+            text: Text to split
+
+        Returns:
+            List of text chunks
+        """
+        chunks = []
+        current = ""
+
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+
+            # Hard-split lines that are longer than a chunk on their own
+            while len(line) > self.chunk_size:
+                if current:
+                    chunks.append(current)
+                    current = ""
+                chunks.append(line[:self.chunk_size])
+                line = line[self.chunk_size:]
+
+            if current and len(current) + len(line) + 1 > self.chunk_size:
+                chunks.append(current)
+                current = line
+            else:
+                current = f"{current}\n{line}" if current else line
+
+        if current:
+            chunks.append(current)
+
+        return chunks
+
+    def has_index(self, index_dir: Path) -> bool:
+        """Check if a vector index has been built in a directory."""
+        return (index_dir / INDEX_FILE).exists() and (index_dir / CHUNKS_FILE).exists()
+
+    def build_index(self, index_dir: Path, documents: Iterable[str]) -> int:
+        """
+        Chunk, embed and index documents, replacing any existing index.
+
+        Args:
+            index_dir: Directory to store the index in
+            documents: Full content documents to index (consumed in one pass)
+
+        Returns:
+            Number of indexed chunks
+        """
+        # Drop the old index first, so an empty or failed build falls back to keyword search
+        self._indexes.pop(str(index_dir), None)
+        for name in (INDEX_FILE, CHUNKS_FILE):
+            (index_dir / name).unlink(missing_ok=True)
+
+        chunks = [chunk for document in documents for chunk in self._chunk_text(document)]
+
+        if not chunks:
+            return 0
+
+        embeddings = self._embed(chunks)
+        index = faiss.IndexFlatIP(embeddings.shape[1])
+        index.add(embeddings)
+
+        # Write under temporary names; the chunks file goes last since has_index checks both
+        index_dir.mkdir(parents=True, exist_ok=True)
+        tmp_index = index_dir / f"{INDEX_FILE}.tmp"
+        faiss.write_index(index, str(tmp_index))
+        os.replace(tmp_index, index_dir / INDEX_FILE)
+
+        tmp_chunks = index_dir / f"{CHUNKS_FILE}.tmp"
+        with open(tmp_chunks, "w", encoding="utf-8") as f:
+            json.dump(chunks, f)
+        os.replace(tmp_chunks, index_dir / CHUNKS_FILE)
+
+        self._indexes[str(index_dir)] = (index, chunks)
+        print(f"[VectorSearch] Indexed {len(chunks)} chunks in {index_dir}")
+
+        return len(chunks)
+
+    def _load_index(self, index_dir: Path) -> Tuple["faiss.Index", List[str]]:
+        """Load an index and its chunks from disk, caching it in memory."""
+        key = str(index_dir)
+        if key not in self._indexes:
+            index = faiss.read_index(str(index_dir / INDEX_FILE))
+            with open(index_dir / CHUNKS_FILE, "r", encoding="utf-8") as f:
+                chunks = json.load(f)
+            self._indexes[key] = (index, chunks)
+
+        return self._indexes[key]
+
+    def search(
+        self,
+        index_dir: Path,
+        question: str,
+        top_k: int = 3,
+        max_chars: int = 4000
+    ) -> List[str]:
+        """
+        Search for the chunks most semantically similar to a question.
+
+        Args:
+            index_dir: Directory containing the persona's index
+            question: The question to answer
+            top_k: Number of top chunks to return
+            max_chars: Maximum total characters to return
+
+        Returns:
+            List of relevant content chunks
+        """
+        index, chunks = self._load_index(index_dir)
+        if not chunks:
+            return []
+
+        _, ids = index.search(self._embed([question]), min(top_k, len(chunks)))
+
+        # Limit total characters
+        total_chars = 0
+        limited_chunks = []
+
+        for i in ids[0]:
+            if i < 0:
+                continue
+            chunk = chunks[i]
+            if total_chars + len(chunk) > max_chars:
+                break
+            limited_chunks.append(chunk)
+            total_chars += len(chunk)
+
+        return limited_chunks